@@ -10,30 +10,38 @@ Automates the entire process of:
 """
 
 import os
+import re
 import sys
+import copy
 import json
 import yaml
 import argparse
-import subprocess
+import asyncio
 import shutil
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Pattern, Set, Tuple, TextIO
+from dataclasses import dataclass, asdict, fields
 from enum import Enum
 import logging
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f'deployment_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# Packer progress heartbeats that are dropped before reaching the log
+_NOISE = re.compile(rb'^\s*==>\s+.*: (Waiting|Uploading) ')
+
+# Read buffer limit for streamed tool output (long lines are common)
+_STREAM_LIMIT = 1 << 20
+
+# Shared compact encoder for JSON output (Packer templates)
+_ENC = json.JSONEncoder(separators=(',', ':'), check_circular=False, ensure_ascii=False)
+
 
 class Color:
     """Terminal color codes"""
@@ -48,6 +56,35 @@ class Color:
     UNDERLINE = '\033[4m'
 
 
+# Precomputed format strings for terminal output
+_CONFIG_SECTION_FMT = f'{{}}{Color.CYAN}{{}}:{Color.ENDC}'
+_CONFIG_ITEM_FMT = f'{{}}{Color.BOLD}{{}}:{Color.ENDC} {{}}'
+_PROMPT_FMT = f'{Color.YELLOW}{{}}: {Color.ENDC}'
+_PROMPT_DEFAULT_FMT = f'{{}} [{Color.GREEN}{{}}{Color.ENDC}]'
+_HEADER_RULE = '=' * 70
+_HEADER_OPEN = f'\n{Color.HEADER}{Color.BOLD}{_HEADER_RULE}'
+_HEADER_CLOSE = f'{_HEADER_RULE}{Color.ENDC}\n'
+_SECTION_FMT = f'\n{Color.CYAN}{Color.BOLD}>>> {{}}{Color.ENDC}\n'
+_YES_NO_FMT = f'{Color.YELLOW}{{}} (y/n): {Color.ENDC}'
+_CHOICE_MENU_FMT = f'\n{Color.YELLOW}{{}}{Color.ENDC}'
+_CHOICE_PROMPT_FMT = f'\n{Color.BOLD}Enter selection (1-{{}}): {Color.ENDC}'
+
+# Accepted answers for prompts
+_YES = frozenset({'y', 'yes'})
+_NO = frozenset({'n', 'no'})
+_NUM_RE = re.compile(r'\s*(\d+)\s*')
+
+# Indentation strings by nesting level, extended on demand
+_INDENTS = ['', '  ', '    ', '      ', '        ']
+
+
+def _indent(level: int) -> str:
+    """Return the indentation string for a nesting level"""
+    while len(_INDENTS) <= level:
+        _INDENTS.append('  ' * len(_INDENTS))
+    return _INDENTS[level]
+
+
 class DeploymentSection(Enum):
     """Deployment sections"""
     PACKER = "packer"
@@ -78,21 +115,98 @@ class PackerConfig:
     additional_disk_size_gb: Optional[int] = None  # For NFS servers
 
 
+# PackerConfig fields exported as Packer user variables
+_TEMPLATE_VARIABLES = frozenset({
+    'vcenter_host', 'vcenter_user', 'vcenter_password', 'vcenter_datacenter',
+    'vcenter_cluster', 'vcenter_datastore', 'vcenter_network', 'vcenter_folder',
+    'template_name', 'iso_datastore', 'iso_path',
+    'cpu_cores', 'memory_mb', 'disk_size_gb',
+})
+_NUMERIC_VARIABLES = frozenset({'cpu_cores', 'memory_mb', 'disk_size_gb'})
+# Left empty in generated templates and passed to Packer via -var-file
+_SECRET_VARIABLES = frozenset({'vcenter_password'})
+
+# ${VAR} placeholders in configuration values, expanded from the environment
+_ENV_PLACEHOLDER = re.compile(r'\$\{(\w+)\}')
+
+_BOOT_COMMAND = (
+    '<esc><esc><esc>',
+    '<enter><wait>',
+    'install <wait>',
+    'preseed/url=http://{{ .HTTPIP }}:{{ .HTTPPort }}/preseed.cfg <wait>',
+    'debian-installer=en_US.UTF-8 <wait>',
+    'auto locale=en_US.UTF-8 <wait>',
+    'kbd-chooser/method=us <wait>',
+    'netcfg/get_hostname={{ .Name }} <wait>',
+    'netcfg/get_domain=local <wait>',
+    'fb=false debconf/verbose=false <wait>',
+    'console-setup/ask_detect=false console-keymaps-at/keymap=us <wait>',
+    '<enter><wait>'
+)
+
+# Static part of the vsphere-iso builder; generate_packer_config fills in
+# guest_os_type, notes and http_directory on a shallow copy
+_BUILDER_SKELETON = {
+    'type': 'vsphere-iso',
+    'vcenter_server': '{{ user `vcenter_host` }}',
+    'username': '{{ user `vcenter_user` }}',
+    'password': '{{ user `vcenter_password` }}',
+    'datacenter': '{{ user `vcenter_datacenter` }}',
+    'cluster': '{{ user `vcenter_cluster` }}',
+    'datastore': '{{ user `vcenter_datastore` }}',
+    'vm_name': '{{ user `template_name` }}',
+    'network': '{{ user `vcenter_network` }}',
+    'folder': '{{ user `vcenter_folder` }}',
+    'iso_datastore': '{{ user `iso_datastore` }}',
+    'iso_path': '{{ user `iso_path` }}',
+    'cpus': '{{ user `cpu_cores` }}',
+    'memory': '{{ user `memory_mb` }}',
+    'disk_size': '{{ user `disk_size_gb` }}',
+    'disk_thin_provisioned': True,
+    'guest_os_type': None,
+    'notes': None,
+    'boot_wait': '10s',
+    'boot_command': _BOOT_COMMAND,
+    'http_directory': None,
+    'http_port_min': 8000,
+    'http_port_max': 9000,
+    'shutdown_command': 'echo \'packer\' | sudo -S shutdown -P now',
+    'communicator': 'ssh',
+    'ssh_username': 'root',
+    'ssh_password': 'packer',
+    'ssh_port': 22,
+    'ssh_timeout': '20m',
+    'ssh_pty': True,
+}
+
+
 class ConfigManager:
     """Manages configuration files and parameters"""
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, stdin: Optional[TextIO] = None):
         self.config_path = Path(config_path) if config_path else None
+        # Read answers from this stream instead of the terminal when set
+        self.stdin = stdin
         self.config: Dict[str, Any] = {}
         self.temp_config: Dict[str, Any] = {}
+        # Parsed configs keyed by (resolved path, mtime_ns, size)
+        self._parse_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        # Directories already created (or found) by save_config
+        self._known_dirs: Set[str] = set()
 
     def load_config(self, path: Path) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         try:
-            with open(path, 'r') as f:
-                config = yaml.safe_load(f)
+            st = path.stat()
+            key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+            if key not in self._parse_cache:
+                # The file changed (or is new); drop entries for older versions
+                self._evict_cached(key[0])
+                with open(path, 'r') as f:
+                    self._parse_cache[key] = yaml.load(f, Loader=_Loader)
             logger.info(f"Loaded configuration from {path}")
-            return config
+            # Hand out a copy so callers can edit it without touching the cache
+            return copy.deepcopy(self._parse_cache[key])
         except FileNotFoundError:
             logger.error(f"Configuration file not found: {path}")
             return {}
@@ -100,78 +214,163 @@ class ConfigManager:
             logger.error(f"Error parsing YAML: {e}")
             return {}
 
+    def _evict_cached(self, resolved: str) -> None:
+        """Drop cached parses of the file at a resolved path"""
+        for key in [k for k in self._parse_cache if k[0] == resolved]:
+            del self._parse_cache[key]
+
     def save_config(self, config: Dict[str, Any], path: Path) -> bool:
-        """Save configuration to YAML file"""
+        """Save configuration to YAML file (or JSON for .json paths)"""
         try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            parent = path.parent
+            if str(parent) not in self._known_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                self._known_dirs.add(str(parent))
+            if path.suffix == '.json':
+                self.save_json(config, path)
+            else:
+                with open(os.fspath(path), 'w', buffering=1 << 16, encoding='utf-8') as f:
+                    yaml.dump(config, f, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+            self._evict_cached(str(path.resolve()))
             logger.info(f"Saved configuration to {path}")
             return True
         except Exception as e:
             logger.error(f"Error saving configuration: {e}")
             return False
 
+    def save_json(self, obj: Any, path: Path) -> None:
+        """Write an object to a JSON file"""
+        with open(os.fspath(path), 'w', buffering=1 << 16, encoding='utf-8') as f:
+            f.write(_ENC.encode(obj))
+
     def print_config(self, config: Dict[str, Any], indent: int = 0) -> None:
         """Pretty print configuration"""
-        for key, value in config.items():
-            if isinstance(value, dict):
-                print(f"{'  ' * indent}{Color.CYAN}{key}:{Color.ENDC}")
-                self.print_config(value, indent + 1)
+        # Walk nested sections with an explicit stack of (level, items) pairs
+        stack = [(indent, iter(config.items()))]
+        while stack:
+            level, items = stack[-1]
+            for key, value in items:
+                if isinstance(value, dict):
+                    print(_CONFIG_SECTION_FMT.format(_indent(level), key))
+                    stack.append((level + 1, iter(value.items())))
+                    break
+                print(_CONFIG_ITEM_FMT.format(_indent(level), key, value))
             else:
-                print(f"{'  ' * indent}{Color.BOLD}{key}:{Color.ENDC} {value}")
+                stack.pop()
+
+    def _read(self, prompt: str) -> str:
+        """Read one line of input, from the injected stream if any"""
+        if self.stdin is None:
+            return input(prompt)
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = self.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip('\n')
 
     def prompt_yes_no(self, message: str) -> bool:
         """Prompt user for yes/no input"""
+        prompt = _YES_NO_FMT.format(message)
         while True:
-            response = input(f"{Color.YELLOW}{message} (y/n): {Color.ENDC}").lower().strip()
-            if response in ['y', 'yes']:
+            response = self._read(prompt).lower().strip()
+            if response in _YES:
                 return True
-            elif response in ['n', 'no']:
+            elif response in _NO:
                 return False
             else:
                 print("Please enter 'y' or 'n'")
 
     def prompt_choice(self, message: str, choices: List[str]) -> str:
         """Prompt user to select from a list of choices"""
+        print(_CHOICE_MENU_FMT.format(message))
+        for i, choice in enumerate(choices, 1):
+            print(f"  {i}. {choice}")
+
+        prompt = _CHOICE_PROMPT_FMT.format(len(choices))
         while True:
-            print(f"\n{Color.YELLOW}{message}{Color.ENDC}")
-            for i, choice in enumerate(choices, 1):
-                print(f"  {i}. {choice}")
-            try:
-                selection = int(input(f"\n{Color.BOLD}Enter selection (1-{len(choices)}): {Color.ENDC}"))
-                if 1 <= selection <= len(choices):
-                    return choices[selection - 1]
-                else:
-                    print(f"Please enter a number between 1 and {len(choices)}")
-            except ValueError:
+            m = _NUM_RE.fullmatch(self._read(prompt))
+            if not m:
                 print("Please enter a valid number")
+            elif 1 <= int(m.group(1)) <= len(choices):
+                return choices[int(m.group(1)) - 1]
+            else:
+                print(f"Please enter a number between 1 and {len(choices)}")
 
     def prompt_value(self, prompt: str, default: Optional[str] = None) -> str:
         """Prompt user for a value with optional default"""
         if default:
-            prompt_text = f"{prompt} [{Color.GREEN}{default}{Color.ENDC}]"
+            prompt_text = _PROMPT_DEFAULT_FMT.format(prompt, default)
         else:
             prompt_text = prompt
         
-        value = input(f"{Color.YELLOW}{prompt_text}: {Color.ENDC}").strip()
+        value = self._read(_PROMPT_FMT.format(prompt_text)).strip()
         return value if value else default or ""
 
 
+class ExternalToolRunner:
+    """Runs external tools as asyncio subprocesses, streaming output into the log"""
+
+    def __init__(self, noise: Optional[Pattern[bytes]] = None):
+        # Output lines matching this pattern are dropped before logging
+        self.noise = noise
+
+    async def run(self, argv: List[str], cwd: Path, *, name: str) -> int:
+        """Run a command and return its exit status
+
+        Every logged line is prefixed with name so that output from
+        concurrent tools stays readable. Raises FileNotFoundError when
+        the executable is missing.
+        """
+        prefix = f"[{name}]"
+        logger.info(f"{prefix} Running: {' '.join(argv)}")
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            limit=_STREAM_LIMIT
+        )
+
+        try:
+            async for raw in proc.stdout:
+                if self.noise is not None and self.noise.match(raw):
+                    continue
+                logger.info(f"{prefix} {raw.decode('utf-8', 'replace').rstrip()}")
+            return await proc.wait()
+        finally:
+            # Don't leave the tool running if streaming failed or was cancelled
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+
+
 class PackerManager:
     """Manages Packer operations"""
 
     def __init__(self, packer_dir: Path):
-        self.packer_dir = Path(packer_dir)
+        self.packer_dir = Path(packer_dir).resolve()
         self.templates_dir = self.packer_dir / "templates"
+        # Generated templates and var files (gitignored)
+        self.build_dir = self.packer_dir / "build"
         self.scripts_dir = self.packer_dir / "scripts"
         self.http_dir = self.packer_dir / "http"
+        self.scripts_base = self.scripts_dir / "base-setup.sh"
+        self.scripts_k3s = self.scripts_dir / "k3s-prep.sh"
+        self.scripts_nfs = self.scripts_dir / "nfs-prep.sh"
+        self.runner = ExternalToolRunner(noise=_NOISE)
 
     def get_available_templates(self) -> List[str]:
         """Get list of available Packer template files"""
-        if not self.templates_dir.exists():
+        try:
+            with os.scandir(self.templates_dir) as it:
+                return [e.name[:-5] for e in it
+                        if e.name.endswith('.json') and e.is_file(follow_symlinks=False)]
+        except FileNotFoundError:
             return []
-        return [f.stem for f in self.templates_dir.glob("*.json")]
 
     def get_required_parameters(self, template_type: str) -> Dict[str, Any]:
         """Get required parameters for a specific template type"""
@@ -199,70 +398,17 @@ class PackerManager:
 
     def generate_packer_config(self, config: PackerConfig) -> Dict[str, Any]:
         """Generate Packer configuration dictionary"""
+        builder = _BUILDER_SKELETON.copy()
+        builder['guest_os_type'] = config.guest_os_type
+        builder['notes'] = f'Template created for {config.template_type}'
+        builder['http_directory'] = str(self.http_dir)
+
         packer_config = {
             'variables': {
-                'vcenter_host': config.vcenter_host,
-                'vcenter_user': config.vcenter_user,
-                'vcenter_password': config.vcenter_password,
-                'vcenter_datacenter': config.vcenter_datacenter,
-                'vcenter_cluster': config.vcenter_cluster,
-                'vcenter_datastore': config.vcenter_datastore,
-                'vcenter_network': config.vcenter_network,
-                'vcenter_folder': config.vcenter_folder,
-                'template_name': config.template_name,
-                'iso_datastore': config.iso_datastore,
-                'iso_path': config.iso_path,
-                'cpu_cores': str(config.cpu_cores),
-                'memory_mb': str(config.memory_mb),
-                'disk_size_gb': str(config.disk_size_gb),
+                k: '' if k in _SECRET_VARIABLES else str(v) if k in _NUMERIC_VARIABLES else v
+                for k, v in asdict(config).items() if k in _TEMPLATE_VARIABLES
             },
-            'builders': [
-                {
-                    'type': 'vsphere-iso',
-                    'vcenter_server': '{{ user `vcenter_host` }}',
-                    'username': '{{ user `vcenter_user` }}',
-                    'password': '{{ user `vcenter_password` }}',
-                    'datacenter': '{{ user `vcenter_datacenter` }}',
-                    'cluster': '{{ user `vcenter_cluster` }}',
-                    'datastore': '{{ user `vcenter_datastore` }}',
-                    'vm_name': '{{ user `template_name` }}',
-                    'network': '{{ user `vcenter_network` }}',
-                    'folder': '{{ user `vcenter_folder` }}',
-                    'iso_datastore': '{{ user `iso_datastore` }}',
-                    'iso_path': '{{ user `iso_path` }}',
-                    'cpus': '{{ user `cpu_cores` }}',
-                    'memory': '{{ user `memory_mb` }}',
-                    'disk_size': '{{ user `disk_size_gb` }}',
-                    'disk_thin_provisioned': True,
-                    'guest_os_type': config.guest_os_type,
-                    'notes': f'Template created for {config.template_type}',
-                    'boot_wait': '10s',
-                    'boot_command': [
-                        '<esc><esc><esc>',
-                        '<enter><wait>',
-                        'install <wait>',
-                        'preseed/url=http://{{ .HTTPIP }}:{{ .HTTPPort }}/preseed.cfg <wait>',
-                        'debian-installer=en_US.UTF-8 <wait>',
-                        'auto locale=en_US.UTF-8 <wait>',
-                        'kbd-chooser/method=us <wait>',
-                        'netcfg/get_hostname={{ .Name }} <wait>',
-                        'netcfg/get_domain=local <wait>',
-                        'fb=false debconf/verbose=false <wait>',
-                        'console-setup/ask_detect=false console-keymaps-at/keymap=us <wait>',
-                        '<enter><wait>'
-                    ],
-                    'http_directory': str(self.http_dir),
-                    'http_port_min': 8000,
-                    'http_port_max': 9000,
-                    'shutdown_command': 'echo \'packer\' | sudo -S shutdown -P now',
-                    'communicator': 'ssh',
-                    'ssh_username': 'root',
-                    'ssh_password': 'packer',
-                    'ssh_port': 22,
-                    'ssh_timeout': '20m',
-                    'ssh_pty': True,
-                }
-            ],
+            'builders': [builder],
             'provisioners': [
                 {
                     'type': 'shell',
@@ -275,7 +421,7 @@ class PackerManager:
                 },
                 {
                     'type': 'shell',
-                    'script': str(self.scripts_dir / 'base-setup.sh')
+                    'script': str(self.scripts_base)
                 }
             ]
         }
@@ -284,61 +430,88 @@ class PackerManager:
         if config.template_type == 'k3s-node':
             packer_config['provisioners'].append({
                 'type': 'shell',
-                'script': str(self.scripts_dir / 'k3s-prep.sh')
+                'script': str(self.scripts_k3s)
             })
         elif config.template_type == 'nfs-server':
             packer_config['provisioners'].append({
                 'type': 'shell',
-                'script': str(self.scripts_dir / 'nfs-prep.sh')
+                'script': str(self.scripts_nfs)
             })
 
         return packer_config
 
-    def run_packer_build(self, template_file: Path, var_file: Optional[Path] = None) -> bool:
-        """Run Packer build"""
+    def generate_var_file(self, config: PackerConfig) -> Dict[str, Any]:
+        """Generate Packer var file contents holding the template secrets"""
+        return {k: getattr(config, k) for k in _SECRET_VARIABLES}
+
+    async def run_packer_build_async(self, template_file: Path, var_file: Optional[Path] = None,
+                                     name: Optional[str] = None) -> bool:
+        """Run Packer build, streaming its output into the log"""
+        # Packer stops parsing options at the template argument, so it goes last
+        cmd = ['packer', 'build']
+        if var_file:
+            cmd.extend(['-var-file', str(var_file)])
+        cmd.append(str(template_file))
+
+        name = name or Path(template_file).stem
+        prefix = f"[{name}]"
         try:
-            cmd = ['packer', 'build', str(template_file)]
-            if var_file:
-                cmd.extend(['-var-file', str(var_file)])
-            
-            logger.info(f"Running Packer build: {' '.join(cmd)}")
-            result = subprocess.run(cmd, cwd=self.packer_dir, check=True)
-            logger.info("Packer build completed successfully")
-            return True
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Packer build failed: {e}")
-            return False
+            returncode = await self.runner.run(cmd, self.packer_dir, name=name)
         except FileNotFoundError:
             logger.error("Packer not found. Please install Packer.")
             return False
 
+        if returncode != 0:
+            logger.error(f"{prefix} Packer build failed: {' '.join(cmd)} exited with status {returncode}")
+            return False
+
+        logger.info(f"{prefix} Packer build completed successfully")
+        return True
+
+    def run_packer_build(self, template_file: Path, var_file: Optional[Path] = None) -> bool:
+        """Run Packer build
+
+        Synchronous wrapper kept as public API for scripts that drive
+        PackerManager without an event loop; the orchestrator itself
+        uses run_packer_build_async.
+        """
+        return asyncio.run(self.run_packer_build_async(template_file, var_file))
+
 
 class DeploymentOrchestrator:
     """Main orchestration class"""
 
-    def __init__(self, base_dir: Optional[str] = None):
-        self.base_dir = Path(base_dir) if base_dir else Path.cwd()
+    def __init__(self, base_dir: Optional[str] = None, stdin: Optional[TextIO] = None,
+                 sequential: bool = False):
+        # Absolute, since Packer runs with packer_dir as its working directory
+        self.base_dir = Path(base_dir).resolve() if base_dir else Path.cwd()
         self.config_dir = self.base_dir / "config"
         self.packer_dir = self.base_dir / "packer"
         self.terraform_dir = self.base_dir / "terraform"
         self.ansible_dir = self.base_dir / "ansible"
         self.helm_dir = self.base_dir / "helm"
+        self.default_config_path = self.config_dir / "default.yaml"
+        self.custom_config_path = self.config_dir / "custom-config.yaml"
         
-        self.config_manager = ConfigManager()
+        self.config_manager = ConfigManager(stdin=stdin)
         self.packer_manager = PackerManager(self.packer_dir)
         self.current_config: Dict[str, Any] = {}
+        # Run external tools one at a time (useful when debugging)
+        self.sequential = sequential
+        # Set when a section stops because of an error rather than the user
+        self.section_failed = False
 
     def print_header(self, text: str) -> None:
         """Print formatted header"""
-        print(f"\n{Color.HEADER}{Color.BOLD}{'=' * 70}")
-        print(f"{text.center(70)}")
-        print(f"{'=' * 70}{Color.ENDC}\n")
+        print(_HEADER_OPEN)
+        print(text.center(70))
+        print(_HEADER_CLOSE)
 
     def print_section(self, text: str) -> None:
         """Print formatted section"""
-        print(f"\n{Color.CYAN}{Color.BOLD}>>> {text}{Color.ENDC}\n")
+        print(_SECTION_FMT.format(text))
 
-    def packer_section(self) -> bool:
+    async def packer_section_async(self) -> bool:
         """Handle Packer section"""
         self.print_header("PACKER SECTION - VM TEMPLATE CREATION")
         
@@ -354,19 +527,19 @@ class DeploymentOrchestrator:
         )
 
         if selection == "Create new template":
-            return self._create_from_existing_config()
+            return await self._create_from_existing_config()
         elif selection == "Create new configuration":
-            return self._create_new_config()
+            return await self._create_new_config()
         elif selection == "Use existing template":
             return self._use_existing_template()
 
-    def _create_from_existing_config(self) -> bool:
+    async def _create_from_existing_config(self) -> bool:
         """Create template from existing configuration"""
         self.print_section("Create New Template from Existing Config")
         
         config_path = Path(self.config_manager.prompt_value(
             "Enter configuration file path",
-            str(self.config_dir / "default.yaml")
+            str(self.default_config_path)
         ))
 
         if not config_path.exists():
@@ -382,17 +555,17 @@ class DeploymentOrchestrator:
         self.config_manager.print_config(config)
 
         if not self.config_manager.prompt_yes_no("\nDo you want to modify any parameters?"):
-            return self._proceed_with_packer_build(config)
+            return await self._proceed_with_packer_build(config)
 
-        return self._handle_parameter_changes(config, config_path)
+        return await self._handle_parameter_changes(config, config_path)
 
-    def _create_new_config(self) -> bool:
+    async def _create_new_config(self) -> bool:
         """Create new configuration from scratch"""
         self.print_section("Create New Configuration")
         
         save_path = Path(self.config_manager.prompt_value(
             "Enter path where to save the configuration",
-            str(self.config_dir / "custom-config.yaml")
+            str(self.custom_config_path)
         ))
 
         config = self._gather_template_parameters()
@@ -406,7 +579,7 @@ class DeploymentOrchestrator:
         if self.config_manager.prompt_yes_no("\nSave this configuration?"):
             if self.config_manager.save_config(config, save_path):
                 self.current_config = config
-                return self._proceed_with_packer_build(config)
+                return await self._proceed_with_packer_build(config)
         
         return False
 
@@ -443,51 +616,53 @@ class DeploymentOrchestrator:
         
         return config
 
-    def _handle_parameter_changes(self, config: Dict[str, Any], config_path: Path) -> bool:
+    async def _handle_parameter_changes(self, config: Dict[str, Any], config_path: Path) -> bool:
         """Handle parameter modification options"""
         while True:
-            # Edit parameters
-            param_to_edit = self.config_manager.prompt_value(
-                "Enter parameter name to change (or 'done' to continue)"
-            )
+            while True:
+                # Edit parameters
+                param_to_edit = self.config_manager.prompt_value(
+                    "Enter parameter name to change (or 'done' to continue)"
+                )
+                
+                if param_to_edit.lower() == 'done':
+                    break
+                
+                if param_to_edit in config:
+                    new_value = self.config_manager.prompt_value(
+                        f"Enter new value for {param_to_edit}",
+                        str(config[param_to_edit])
+                    )
+                    config[param_to_edit] = new_value
+                    print(f"{Color.GREEN}Parameter updated{Color.ENDC}\n")
+                else:
+                    print(f"{Color.RED}Parameter not found{Color.ENDC}\n")
             
-            if param_to_edit.lower() == 'done':
-                break
+            # Ask what to do with changes
+            choices = [
+                "Write changes to config permanently",
+                "Use changes only for this run",
+                "Return to editing",
+                "Discard changes"
+            ]
             
-            if param_to_edit in config:
-                new_value = self.config_manager.prompt_value(
-                    f"Enter new value for {param_to_edit}",
-                    str(config[param_to_edit])
-                )
-                config[param_to_edit] = new_value
-                print(f"{Color.GREEN}Parameter updated{Color.ENDC}\n")
-            else:
-                print(f"{Color.RED}Parameter not found{Color.ENDC}\n")
-        
-        # Ask what to do with changes
-        choices = [
-            "Write changes to config permanently",
-            "Use changes only for this run",
-            "Return to editing",
-            "Discard changes"
-        ]
-        
-        decision = self.config_manager.prompt_choice(
-            "What would you like to do with these changes?",
-            choices
-        )
-        
-        if decision == "Write changes to config permanently":
-            if self.config_manager.save_config(config, config_path):
-                return self._proceed_with_packer_build(config)
-        elif decision == "Use changes only for this run":
-            return self._proceed_with_packer_build(config)
-        elif decision == "Return to editing":
-            return self._handle_parameter_changes(config, config_path)
-        else:  # Discard changes
-            logger.info("Changes discarded")
-            original_config = self.config_manager.load_config(config_path)
-            return self._proceed_with_packer_build(original_config)
+            decision = self.config_manager.prompt_choice(
+                "What would you like to do with these changes?",
+                choices
+            )
+            
+            if decision == "Write changes to config permanently":
+                if self.config_manager.save_config(config, config_path):
+                    return await self._proceed_with_packer_build(config)
+                return False
+            elif decision == "Use changes only for this run":
+                return await self._proceed_with_packer_build(config)
+            elif decision == "Return to editing":
+                continue
+            else:  # Discard changes
+                logger.info("Changes discarded")
+                original_config = self.config_manager.load_config(config_path)
+                return await self._proceed_with_packer_build(original_config)
 
     def _use_existing_template(self) -> bool:
         """Use existing template and proceed to Terraform"""
@@ -515,26 +690,177 @@ class DeploymentOrchestrator:
             return True
         return False
 
-    def _proceed_with_packer_build(self, config: Dict[str, Any]) -> bool:
+    async def _proceed_with_packer_build(self, config: Dict[str, Any]) -> bool:
         """Proceed with Packer build"""
         self.current_config = config
         
         if self.config_manager.prompt_yes_no("\nProceed with Packer template creation?"):
             self.print_section("Building Packer Template")
             
-            # For now, just simulate
-            print(f"{Color.GREEN}Packer build would run here{Color.ENDC}")
-            print(f"Template Type: {config.get('template_type', 'unknown')}")
-            print(f"Template Name: {config.get('template_name', 'unknown')}")
-            
-            logger.info(f"Packer build configured: {config.get('template_name')}")
+            packer_configs = self._packer_configs_from(config)
+            if not packer_configs:
+                self.section_failed = True
+                return False
+
+            for packer_config in packer_configs:
+                print(f"Template Type: {packer_config.template_type}")
+                print(f"Template Name: {packer_config.template_name}")
+                logger.info(f"Packer build configured: {packer_config.template_name}")
+
+            if not await self._build_templates_async(packer_configs):
+                self.section_failed = True
+                return False
+
+            print(f"{Color.GREEN}Packer build completed{Color.ENDC}")
             
             if self.config_manager.prompt_yes_no("\nProceed to Terraform section?"):
                 return True
         
         return False
 
-    def run(self) -> None:
+    def _packer_configs_from(self, config: Dict[str, Any]) -> List[PackerConfig]:
+        """Build the Packer template configurations described by a config
+
+        A wizard-style config (with 'template_type') describes one template,
+        while a full deployment config (see config/default.yaml) describes
+        both the k3s node and the NFS server templates.
+        """
+        if not isinstance(config, dict):
+            logger.error("Configuration must be a mapping of parameters")
+            return []
+
+        if 'template_type' in config:
+            specs = [config]
+        else:
+            vsphere = config.get('vsphere') or {}
+            packer = config.get('packer') or {}
+            for section, value in (('vsphere', vsphere), ('packer', packer)):
+                if not isinstance(value, dict):
+                    logger.error(f"Configuration section '{section}' must be a mapping, got: {value!r}")
+                    return []
+            common = {
+                'vcenter_host': vsphere.get('host'),
+                'vcenter_user': vsphere.get('user'),
+                'vcenter_password': vsphere.get('password'),
+                'vcenter_datacenter': vsphere.get('datacenter'),
+                'vcenter_cluster': vsphere.get('cluster'),
+                'vcenter_datastore': vsphere.get('datastore'),
+                'vcenter_network': vsphere.get('network'),
+                'vcenter_folder': vsphere.get('folder'),
+                'iso_datastore': packer.get('iso_datastore'),
+                'iso_path': packer.get('iso_path'),
+                'guest_os_type': packer.get('guest_os_type'),
+            }
+            specs = []
+            for template_type in ('k3s-node', 'nfs-server'):
+                key = template_type.replace('-', '_')
+                if key in packer:
+                    if not isinstance(packer[key], dict):
+                        logger.error(f"Configuration section 'packer.{key}' must be a mapping, got: {packer[key]!r}")
+                        return []
+                    specs.append({
+                        **common,
+                        **packer[key],
+                        'template_type': template_type,
+                        'template_name': packer.get(f'{key}_template', f'debian-{template_type}-template'),
+                    })
+
+        known = {f.name for f in fields(PackerConfig)}
+        packer_configs = []
+        for spec in specs:
+            unset = sorted({
+                name for v in spec.values() if isinstance(v, str)
+                for name in _ENV_PLACEHOLDER.findall(v) if name not in os.environ
+            })
+            if unset:
+                logger.error(f"Environment variables not set for {spec.get('template_name', 'unknown')}: {', '.join(unset)}")
+                return []
+            spec = {
+                k: _ENV_PLACEHOLDER.sub(lambda m: os.environ[m.group(1)], v) if isinstance(v, str) else v
+                for k, v in spec.items()
+            }
+            try:
+                packer_configs.append(PackerConfig(
+                    **{k: v for k, v in spec.items() if k in known and v is not None}
+                ))
+            except TypeError as e:
+                logger.error(f"Incomplete Packer configuration for {spec.get('template_name', 'unknown')}: {e}")
+                return []
+
+        if not packer_configs:
+            logger.error("No Packer templates defined in configuration")
+        return packer_configs
+
+    def _max_parallel(self) -> int:
+        """Get the limit on concurrent external tool runs"""
+        if self.sequential:
+            return 1
+
+        raw = os.environ.get('DEPLOY_MAX_PARALLEL', '4')
+        try:
+            limit = int(raw)
+        except ValueError:
+            logger.warning(f"Invalid DEPLOY_MAX_PARALLEL value {raw!r}, using 4")
+            return 4
+        if limit < 1:
+            logger.warning(f"DEPLOY_MAX_PARALLEL must be at least 1 (got {limit}), using 1")
+            return 1
+        return limit
+
+    async def _gather_limited(self, coros: List[Any]) -> List[Any]:
+        """Run coroutines concurrently, at most DEPLOY_MAX_PARALLEL at a time"""
+        sem = asyncio.Semaphore(self._max_parallel())
+
+        async def _one(coro):
+            async with sem:
+                return await coro
+
+        return await asyncio.gather(*(_one(c) for c in coros), return_exceptions=True)
+
+    async def _build_template_async(self, packer_config: PackerConfig) -> bool:
+        """Generate one Packer template under packer/build and run packer build on it"""
+        build_dir = self.packer_manager.build_dir
+        template_file = build_dir / f"{packer_config.template_name}.json"
+        var_file = build_dir / f"{packer_config.template_name}.secrets.json"
+        if not self.config_manager.save_config(
+            self.packer_manager.generate_packer_config(packer_config), template_file
+        ):
+            return False
+
+        # Keep secrets out of the template, in an owner-only file removed after the build
+        try:
+            var_file.touch(mode=0o600)
+            var_file.chmod(0o600)
+            if not self.config_manager.save_config(
+                self.packer_manager.generate_var_file(packer_config), var_file
+            ):
+                return False
+            return await self.packer_manager.run_packer_build_async(
+                template_file, var_file, name=packer_config.template_name
+            )
+        finally:
+            var_file.unlink(missing_ok=True)
+
+    async def _build_templates_async(self, packer_configs: List[PackerConfig]) -> bool:
+        """Build Packer templates concurrently"""
+        # Builds are keyed on template name under packer/build, so names must be unique
+        names = [c.template_name for c in packer_configs]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            logger.error(f"Duplicate Packer template names: {', '.join(duplicates)}")
+            return False
+
+        results = await self._gather_limited([self._build_template_async(c) for c in packer_configs])
+
+        succeeded = True
+        for packer_config, result in zip(packer_configs, results):
+            if isinstance(result, Exception):
+                logger.error(f"[{packer_config.template_name}] Packer build raised: {result}")
+            if result is not True:
+                succeeded = False
+        return succeeded
+
+    async def run_async(self) -> None:
         """Run the deployment orchestration"""
         self.print_header("K3s INFRASTRUCTURE DEPLOYMENT ORCHESTRATION")
         
@@ -543,14 +869,38 @@ class DeploymentOrchestrator:
         print(f"{Color.BOLD}Packer Directory:{Color.ENDC} {self.packer_dir}\n")
         
         # Run Packer section
-        if self.packer_section():
+        self.section_failed = False
+        if await self.packer_section_async():
             self.print_header("PACKER SECTION COMPLETED")
             print(f"{Color.GREEN}✓ Ready to proceed to next section{Color.ENDC}\n")
+        elif self.section_failed:
+            self.print_header("PACKER SECTION FAILED")
+            print(f"{Color.RED}Packer section failed, see log for details{Color.ENDC}\n")
+            return
         else:
             self.print_header("PACKER SECTION CANCELLED")
             print(f"{Color.YELLOW}Deployment cancelled by user{Color.ENDC}\n")
             return
 
+    def run(self) -> None:
+        """Run the deployment orchestration on a new event loop"""
+        asyncio.run(self.run_async())
+
+
+def _configure_logging() -> None:
+    """Attach console and timestamped log file handlers to the root logger
+
+    The log file is opened lazily, on the first emitted record.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(f'deployment_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log', delay=True),
+            logging.StreamHandler()
+        ]
+    )
+
 
 def main():
     """Main entry point"""
@@ -561,6 +911,7 @@ def main():
 Examples:
   python3 deploy.py                  # Run with default paths
   python3 deploy.py --base /path     # Specify base directory
+  python3 deploy.py --sequential     # Run external tools one at a time
         """
     )
     
@@ -578,10 +929,17 @@ Examples:
         default=None
     )
     
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Run external tools one at a time instead of concurrently'
+    )
+    
     args = parser.parse_args()
+    _configure_logging()
     
     try:
-        orchestrator = DeploymentOrchestrator(args.base)
+        orchestrator = DeploymentOrchestrator(args.base, sequential=args.sequential)
         orchestrator.run()
     except KeyboardInterrupt:
         print(f"\n\n{Color.YELLOW}Deployment interrupted by user{Color.ENDC}")